@@ -6,65 +6,172 @@ Creates reports for all companies that don't have one
 
 import asyncio
 import json
+import logging
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 try:
-    from playwright.async_api import async_playwright
     import requests
     import urllib3
 except ImportError:
     print("ERROR: Required packages not installed")
-    print("Install with: pip install playwright requests urllib3")
+    print("Install with: pip install requests urllib3")
     sys.exit(1)
 
+# Playwright is only needed for the browser login fallback
+try:
+    from playwright.async_api import async_playwright, Error as PlaywrightError
+except ImportError:
+    async_playwright = PlaywrightError = None
+
+# orjson is optional and only speeds up JSON encoding/decoding
+try:
+    import orjson
+    json_dumps, json_loads = orjson.dumps, orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
+# ijson is optional and lets the report list be parsed as it is downloaded
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-async def get_token_and_cookie(vspc_url, username, password):
-    """Use Playwright to login and capture token + cookie"""
-    print("[*] Starting headless browser...")
+log = logging.getLogger(__name__)
+
+# Maximum number of companies processed in parallel against VSPC
+MAX_CONCURRENCY = 20
+
+# Retry throttled/unavailable responses with exponential backoff, honoring Retry-After.
+# Only statuses where VSPC did not process the call are retried, as Report/Save is not idempotent.
+RETRY = urllib3.Retry(
+    total=5,
+    read=0,
+    backoff_factor=0.5,
+    status_forcelist=[429, 503],
+    allowed_methods=["POST"],
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# Static part of every report; name, description, companies and locations are set per company
+REPORT_TEMPLATE = {
+    "type": "protectedComputers",
+    "parameters": {
+        "accessMode": "public",
+        "aggregationMode": "singleCompany",
+        "rpoInterval": {"number": 1, "period": "day"},
+        "excludeMask": "",
+        "groupBy": 1,
+        "includeCompaniesDetails": False,
+        "allCompaniesAndNewlyAdded": False,
+        "includeResellerCompanies": False,
+        "emailOptions": "%Company Owner%",
+        "operationModeFilter": [-1],
+        "managementTypeFilter": [-1],
+        "guestOsFilter": [0, 1, 2]
+    },
+    "schedule": {
+        "type": "daily",
+        "daily": {
+            "time": "08:00",
+            "kind": "everyDay",
+            "days": ["sunday", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday"]
+        },
+        "monthly": {
+            "time": "07:00",
+            "week": "first",
+            "day": "sunday",
+            "dayNumber": 1,
+            "months": ["january", "february", "march", "april", "may", "june", "july", "august", "september", "october", "november", "december"]
+        },
+        "timeZoneId": "Romance Standard Time"
+    }
+}
+
+# Resource types not needed to log in
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media"}
+
+def get_token(vspc_url, username, password):
+    """Request token + cookie directly from the VSPC token endpoint"""
+    log.info(f"[*] Requesting access token as {username}...")
+    try:
+        response = requests.post(
+            f"{vspc_url}/api/v3/token",
+            data={"grant_type": "password", "username": username, "password": password},
+            verify=False
+        )
+        response.raise_for_status()
+        token = response.json().get("access_token")
+    except (requests.RequestException, ValueError) as e:
+        log.error(f"[!] Token request failed: {e}")
+        return None, None
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(ignore_https_errors=True)
-        page = await context.new_page()
+    x_auth_cookie = response.cookies.get("x-authorization")
+    if token and x_auth_cookie:
+        log.info("[+] Authentication credentials captured")
 
-        captured_token = {'token': None}
+    return token, x_auth_cookie
 
-        async def handle_response(response):
-            if '/api/v3/token' in response.url and response.status == 200:
-                try:
-                    data = await response.json()
-                    captured_token['token'] = data.get('access_token')
-                except:
-                    pass
+async def get_token_and_cookie(vspc_url, username, password, auth_state=None):
+    """Use Playwright to login and capture token + cookie
 
-        page.on('response', handle_response)
+    If auth_state is set, the browser session saved there by a previous run
+    is tried first, and the session is saved back after a successful login.
+    """
+    if async_playwright is None:
+        log.error("[!] Browser login requires Playwright")
+        log.error("Install with: pip install playwright && python3 -m playwright install chromium")
+        return None, None
 
-        print(f"[*] Navigating to {vspc_url}/login...")
-        await page.goto(f"{vspc_url}/login", wait_until="networkidle", timeout=30000)
+    log.info("[*] Starting headless browser...")
 
-        print(f"[*] Logging in as {username}...")
-        await page.fill('input[type="text"], input[name="username"]', username)
-        await page.fill('input[type="password"], input[name="password"]', password)
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
 
-        try:
-            await page.click('button:has-text("Log in")', timeout=5000)
-        except:
-            try:
-                await page.click('button[type="submit"]', timeout=5000)
-            except:
-                await page.click('button', timeout=5000)
+        async def block_resources(route):
+            if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+                await route.abort()
+            else:
+                await route.continue_()
 
-        try:
-            await page.wait_for_url(f"{vspc_url}/home/**", timeout=10000)
-        except:
-            await page.wait_for_timeout(5000)
+        async def new_page(context):
+            page = await context.new_page()
+            await page.route("**/*", block_resources)
+            return page
+
+        context = None
+        token = None
+        if auth_state:
+            try:
+                context = await browser.new_context(ignore_https_errors=True, storage_state=auth_state)
+            except (OSError, ValueError):
+                log.info(f"[*] No saved session in {auth_state}")
+
+        if context:
+            log.info(f"[*] Reusing saved session from {auth_state}...")
+            page = await new_page(context)
+            token = await capture_token(
+                page,
+                lambda: page.goto(f"{vspc_url}/home", wait_until="domcontentloaded", timeout=30000)
+            )
+            if not token:
+                log.info("[*] Saved session expired")
+                await context.close()
+                context = None
 
-        print("[+] Login successful")
+        if not context:
+            context = await browser.new_context(ignore_https_errors=True)
+            page = await new_page(context)
+            token = await login_with_form(page, vspc_url, username, password)
 
-        token = captured_token['token']
         cookies = await context.cookies()
         x_auth_cookie = None
         for cookie in cookies:
@@ -72,13 +179,56 @@ async def get_token_and_cookie(vspc_url, username, password):
                 x_auth_cookie = cookie['value']
                 break
 
-        await browser.close()
-
         if token and x_auth_cookie:
-            print(f"[+] Authentication credentials captured")
+            log.info(f"[+] Authentication credentials captured")
+            if auth_state:
+                await context.storage_state(path=auth_state)
+
+        await browser.close()
 
         return token, x_auth_cookie
 
+async def capture_token(page, action, timeout=10000):
+    """Run a page action and return the access token from the /api/v3/token response it triggers"""
+    try:
+        async with page.expect_response(
+            lambda r: '/api/v3/token' in r.url and r.status == 200,
+            timeout=timeout
+        ) as response_info:
+            await action()
+        response = await response_info.value
+        return (await response.json()).get('access_token')
+    except (PlaywrightError, ValueError):
+        return None
+
+async def login_with_form(page, vspc_url, username, password):
+    """Fill and submit the VSPC login form, returning the access token"""
+    log.info(f"[*] Navigating to {vspc_url}/login...")
+    await page.goto(f"{vspc_url}/login", wait_until="domcontentloaded", timeout=30000)
+
+    log.info(f"[*] Logging in as {username}...")
+    await page.fill('input[type="text"], input[name="username"]', username)
+    await page.fill('input[type="password"], input[name="password"]', password)
+
+    async def submit():
+        try:
+            await page.click('button:has-text("Log in")', timeout=5000)
+        except:
+            try:
+                await page.click('button[type="submit"]', timeout=5000)
+            except:
+                await page.click('button', timeout=5000)
+
+    # Leave room for the click fallbacks on top of the token response itself
+    token = await capture_token(page, submit, timeout=20000)
+    if token:
+        log.info("[+] Login successful")
+    return token
+
+def _company_id(company):
+    """Return the ID of a company entry from GetCompanyList"""
+    return company.get("companyId") or company.get("id") or company.get("instanceUid")
+
 class VSPCReportManager:
     def __init__(self, vspc_url, token, cookie):
         self.vspc_url = vspc_url
@@ -86,42 +236,59 @@ class VSPCReportManager:
         self.cookie = cookie
         self.session = requests.Session()
         self.session.verify = False
+        self.session.trust_env = False
+
+        # One pool for the VSPC host, sized to the number of concurrent workers so every
+        # worker keeps its connection alive and no more TLS handshakes than that are made
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=MAX_CONCURRENCY,
+            pool_block=True,
+            max_retries=RETRY
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
-    def _make_request(self, endpoint, payload=None):
-        """Make authenticated request to VSPC"""
-        headers = {
+        # Auth headers and cookie are static for the whole run
+        self.session.headers.update({
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json",
             "Accept": "application/json",
             "x-ui-request": "true",
             "Origin": self.vspc_url
-        }
-        cookies = {"x-authorization": self.cookie}
+        })
+        self.session.cookies.set("x-authorization", self.cookie)
 
-        response = self.session.post(
-            f"{self.vspc_url}{endpoint}",
-            headers=headers,
-            cookies=cookies,
-            json=payload or {}
-        )
+    def _make_request(self, endpoint, payload=None):
+        """Make authenticated request to VSPC"""
+        response = self.session.post(f"{self.vspc_url}{endpoint}", data=json_dumps(payload or {}))
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content)
 
     def get_companies(self):
         """Get all companies"""
-        print("\n[*] Retrieving all companies...")
+        log.info("\n[*] Retrieving all companies...")
         result = self._make_request("/uiapi/Company/GetCompanyList")
         companies = result.get("data", [])
-        print(f"[+] Found {len(companies)} companies")
+        log.info(f"[+] Found {len(companies)} companies")
         return companies
 
-    def get_existing_reports(self):
-        """Get all existing reports"""
-        print("[*] Retrieving existing reports...")
-        result = self._make_request("/uiapi/Report/GetReports")
-        reports = result.get("data", [])
-        print(f"[+] Found {len(reports)} existing reports")
-        return reports
+    def iter_existing_reports(self):
+        """Yield all existing reports, streaming the response when ijson is available"""
+        log.info("[*] Retrieving existing reports...")
+        count = 0
+        if ijson is None:
+            reports = self._make_request("/uiapi/Report/GetReports").get("data", [])
+            for count, report in enumerate(reports, 1):
+                yield report
+        else:
+            with self.session.post(f"{self.vspc_url}/uiapi/Report/GetReports",
+                                   data=json_dumps({}), stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                for count, report in enumerate(ijson.items(response.raw, "data.item"), 1):
+                    yield report
+        log.info(f"[+] Found {count} existing reports")
 
     def get_locations_for_company(self, company_id):
         """Get locations for a company"""
@@ -129,45 +296,19 @@ class VSPCReportManager:
         locations = result.get("data", [])
         return locations
 
-    def create_report(self, company_name, company_id, location_ids=None):
+    def create_report(self, company_name, company_id, location_ids=None, created_at=None):
         """Create a report for a company"""
-        report_name = f"Protected Computers - {company_name} - {datetime.now().strftime('%Y%m%d')}"
+        created_at = created_at or datetime.now()
+        report_name = f"Protected Computers - {company_name} - {created_at.strftime('%Y%m%d')}"
 
         payload = {
-            "type": "protectedComputers",
+            **REPORT_TEMPLATE,
             "name": report_name,
-            "description": f"Auto-created for {company_name} at {datetime.now().strftime('%d/%m/%Y %H:%M')}",
+            "description": f"Auto-created for {company_name} at {created_at.strftime('%d/%m/%Y %H:%M')}",
             "parameters": {
-                "accessMode": "public",
-                "aggregationMode": "singleCompany",
+                **REPORT_TEMPLATE["parameters"],
                 "companies": [company_id],
-                "locations": location_ids or [],
-                "rpoInterval": {"number": 1, "period": "day"},
-                "excludeMask": "",
-                "groupBy": 1,
-                "includeCompaniesDetails": False,
-                "allCompaniesAndNewlyAdded": False,
-                "includeResellerCompanies": False,
-                "emailOptions": "%Company Owner%",
-                "operationModeFilter": [-1],
-                "managementTypeFilter": [-1],
-                "guestOsFilter": [0, 1, 2]
-            },
-            "schedule": {
-                "type": "daily",
-                "daily": {
-                    "time": "08:00",
-                    "kind": "everyDay",
-                    "days": ["sunday", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday"]
-                },
-                "monthly": {
-                    "time": "07:00",
-                    "week": "first",
-                    "day": "sunday",
-                    "dayNumber": 1,
-                    "months": ["january", "february", "march", "april", "may", "june", "july", "august", "september", "october", "november", "december"]
-                },
-                "timeZoneId": "Romance Standard Time"
+                "locations": location_ids or []
             }
         }
 
@@ -177,106 +318,128 @@ class VSPCReportManager:
             return True, report_name
         return False, None
 
-    def find_companies_without_reports(self, companies, reports, verbose=False):
-        """Find companies that don't have reports"""
-        print("\n[*] Analyzing companies and reports...")
+    def find_companies_without_reports(self, companies, reports):
+        """Find companies that don't have reports
+
+        reports may be any iterable, such as iter_existing_reports(); it is only
+        kept in memory when debug output needs to walk it twice.
+        """
+        if log.isEnabledFor(logging.DEBUG):
+            reports = list(reports)
+
+        companies_with_reports = {r["companyID"] for r in reports if r.get("companyID")}
+
+        log.info("\n[*] Analyzing companies and reports...")
 
-        # Build a map of company ID -> company info
-        company_map = {}
+        # Keyed by ID so a company listed twice only gets one report
+        companies_without_reports = list({
+            company_id: {"id": company_id, "name": company.get("name", "Unknown")}
+            for company_id, company in zip(map(_company_id, companies), companies)
+            if company_id and company_id not in companies_with_reports
+        }.values())
+
+        if log.isEnabledFor(logging.DEBUG):
+            self._log_report_diagnostics(companies, reports, companies_without_reports)
+
+        log.info(f"\n[+] Companies WITH reports: {len(companies_with_reports)}")
+        log.info(f"[+] Companies WITHOUT reports: {len(companies_without_reports)}")
+
+        return companies_without_reports
+
+    def _log_report_diagnostics(self, companies, reports, companies_without_reports):
+        """Log the company/report mapping used to detect missing reports"""
+        company_names = {}
         for company in companies:
-            company_id = company.get("companyId") or company.get("id") or company.get("instanceUid")
-            company_name = company.get("name", "Unknown")
+            company_id = _company_id(company)
             if company_id:
-                company_map[company_id] = {
-                    "id": company_id,
-                    "name": company_name
-                }
+                company_names[company_id] = company.get("name", "Unknown")
 
-        if verbose:
-            print(f"\n[DEBUG] Company IDs found:")
-            for cid, info in company_map.items():
-                print(f"  ID {cid}: {info['name']}")
-
-        # Extract company IDs from existing reports
-        companies_with_reports = {}
+        log.debug(f"\n[DEBUG] Company IDs found:")
+        for cid, name in company_names.items():
+            log.debug(f"  ID {cid}: {name}")
 
+        report_names_by_company = {}
         for report in reports:
             report_name = report.get("name", "Unnamed")
             company_id = report.get("companyID")
 
-            if verbose:
-                print(f"\n[DEBUG] Report '{report_name}' -> Company ID: {company_id} ({report.get('companyName', 'Unknown')})")
+            log.debug(f"\n[DEBUG] Report '{report_name}' -> Company ID: {company_id} ({report.get('companyName', 'Unknown')})")
 
             if company_id:
-                if company_id not in companies_with_reports:
-                    companies_with_reports[company_id] = []
-                companies_with_reports[company_id].append(report_name)
-
-        if verbose:
-            print(f"\n[DEBUG] Companies with reports:")
-            for cid, report_names in companies_with_reports.items():
-                company_name = company_map.get(cid, {}).get("name", "Unknown")
-                print(f"  ID {cid} ({company_name}): {len(report_names)} report(s)")
-                for rname in report_names:
-                    print(f"    - {rname}")
-
-        # Find companies without reports
-        companies_without_reports = []
-
-        for company_id, company_info in company_map.items():
-            if company_id not in companies_with_reports:
-                companies_without_reports.append(company_info)
-                if verbose:
-                    print(f"\n[DEBUG] Company {company_id} ({company_info['name']}) has NO reports")
-
-        print(f"\n[+] Companies WITH reports: {len(companies_with_reports)}")
-        print(f"[+] Companies WITHOUT reports: {len(companies_without_reports)}")
-
-        return companies_without_reports
-
-    def create_reports_for_companies(self, companies, dry_run=False):
+                report_names_by_company.setdefault(company_id, []).append(report_name)
+
+        log.debug(f"\n[DEBUG] Companies with reports:")
+        for cid, report_names in report_names_by_company.items():
+            log.debug(f"  ID {cid} ({company_names.get(cid, 'Unknown')}): {len(report_names)} report(s)")
+            for rname in report_names:
+                log.debug(f"    - {rname}")
+
+        for company in companies_without_reports:
+            log.debug(f"\n[DEBUG] Company {company['id']} ({company['name']}) has NO reports")
+
+    def _create_report_for_company(self, company, include_locations=False, created_at=None):
+        """Create the report for a single company, optionally listing its locations"""
+        location_ids = None
+        location_names = []
+        if include_locations:
+            locations = self.get_locations_for_company(company["id"])
+            location_ids = [loc.get("locationId") or loc.get("id") for loc in locations]
+            location_names = [loc.get("name") for loc in locations]
+        success, report_name = self.create_report(company["name"], company["id"], location_ids, created_at)
+        return location_names, success, report_name
+
+    async def create_reports_for_companies(self, companies, dry_run=False, include_locations=False):
         """Create reports for multiple companies"""
-        print(f"\n{'=' * 60}")
-        print(f"{'DRY RUN - ' if dry_run else ''}Creating Reports")
-        print(f"{'=' * 60}")
+        log.info(f"\n{'=' * 60}")
+        log.info(f"{'DRY RUN - ' if dry_run else ''}Creating Reports")
+        log.info(f"{'=' * 60}")
 
         results = {
             "success": [],
             "failed": []
         }
 
-        for i, company in enumerate(companies, 1):
+        if dry_run:
+            outcomes = [None] * len(companies)
+        else:
+            # All reports of a batch share the same creation date
+            created_at = datetime.now()
+
+            # Run the per-company API calls concurrently, bounded by the pool size
+            loop = asyncio.get_running_loop()
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+                outcomes = await asyncio.gather(
+                    *(loop.run_in_executor(executor, self._create_report_for_company,
+                                          company, include_locations, created_at)
+                      for company in companies),
+                    return_exceptions=True
+                )
+
+        for i, (company, outcome) in enumerate(zip(companies, outcomes), 1):
             company_id = company["id"]
             company_name = company["name"]
 
-            print(f"\n[{i}/{len(companies)}] Processing: {company_name} (ID: {company_id})")
+            log.info(f"\n[{i}/{len(companies)}] Processing: {company_name} (ID: {company_id})")
 
             if dry_run:
-                print(f"    [DRY RUN] Would create report for {company_name}")
+                log.info(f"    [DRY RUN] Would create report for {company_name}")
                 results["success"].append(company_name)
                 continue
 
-            try:
-                # Get locations
-                locations = self.get_locations_for_company(company_id)
-                location_ids = []
-                if locations:
-                    location_ids = [loc.get("locationId") or loc.get("id") for loc in locations]
-                    location_names = [loc.get("name") for loc in locations]
-                    print(f"    [*] Locations: {', '.join(location_names)}")
-
-                # Create report
-                success, report_name = self.create_report(company_name, company_id, location_ids)
-
-                if success:
-                    print(f"    [+] SUCCESS: {report_name}")
-                    results["success"].append(company_name)
-                else:
-                    print(f"    [!] FAILED: Could not create report")
-                    results["failed"].append(company_name)
-
-            except Exception as e:
-                print(f"    [!] ERROR: {e}")
+            if isinstance(outcome, Exception):
+                log.error(f"    [!] ERROR: {outcome}")
+                results["failed"].append(company_name)
+                continue
+
+            location_names, success, report_name = outcome
+            if location_names:
+                log.info(f"    [*] Locations: {', '.join(location_names)}")
+
+            if success:
+                log.info(f"    [+] SUCCESS: {report_name}")
+                results["success"].append(company_name)
+            else:
+                log.error(f"    [!] FAILED: Could not create report")
                 results["failed"].append(company_name)
 
         return results
@@ -288,81 +451,98 @@ async def main():
     parser.add_argument("--url", required=True, help="VSPC URL")
     parser.add_argument("--login", required=True, help="Username")
     parser.add_argument("--password", required=True, help="Password")
+    parser.add_argument("--use-browser", action="store_true",
+                        help="Log in through a headless browser instead of the token API")
+    parser.add_argument("--auth-state", metavar="FILE",
+                        help="Save the browser session to FILE and reuse it on later runs (browser login only)")
     parser.add_argument("--company", help="Create report for specific company only")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be created")
+    parser.add_argument("--include-locations", action="store_true",
+                        help="List each company's locations explicitly in its report "
+                             "(by default the location list is left empty, which VSPC expands to all locations)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Show detailed debug output")
 
     args = parser.parse_args()
 
-    print("=" * 60)
-    print("VSPC Bulk Report Creator")
-    print("=" * 60)
+    logging.basicConfig(stream=sys.stdout, format="%(message)s", level=logging.INFO)
+    log.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+
+    log.info("=" * 60)
+    log.info("VSPC Bulk Report Creator")
+    log.info("=" * 60)
 
     # Authenticate
-    token, cookie = await get_token_and_cookie(args.url, args.login, args.password)
+    if args.use_browser:
+        token, cookie = await get_token_and_cookie(args.url, args.login, args.password, args.auth_state)
+    else:
+        token, cookie = get_token(args.url, args.login, args.password)
+        if (not token or not cookie) and async_playwright is not None:
+            log.info("[*] Falling back to browser login...")
+            token, cookie = await get_token_and_cookie(args.url, args.login, args.password, args.auth_state)
 
     if not token or not cookie:
-        print("[!] Authentication failed")
+        log.error("[!] Authentication failed")
         sys.exit(1)
 
     # Initialize manager
     manager = VSPCReportManager(args.url, token, cookie)
 
     try:
-        # Get companies and reports
+        # Get companies (existing reports are only needed in bulk mode)
         all_companies = manager.get_companies()
-        existing_reports = manager.get_existing_reports()
 
         if args.company:
             # Single company mode
             target_companies = [c for c in all_companies if c.get("name", "").lower() == args.company.lower()]
             if not target_companies:
-                print(f"[!] Company '{args.company}' not found")
-                print(f"[*] Available: {[c.get('name') for c in all_companies]}")
+                log.error(f"[!] Company '{args.company}' not found")
+                log.info(f"[*] Available: {[c.get('name') for c in all_companies]}")
                 sys.exit(1)
 
             companies_to_process = [{
-                "id": target_companies[0].get("companyId") or target_companies[0].get("id"),
+                "id": _company_id(target_companies[0]),
                 "name": target_companies[0].get("name")
             }]
         else:
             # Bulk mode - find companies without reports
+            existing_reports = manager.iter_existing_reports()
             companies_to_process = manager.find_companies_without_reports(
                 all_companies, 
-                existing_reports,
-                verbose=args.verbose
+                existing_reports
             )
 
         if not companies_to_process:
-            print("\n[+] All companies already have reports!")
+            log.info("\n[+] All companies already have reports!")
             sys.exit(0)
 
-        print(f"\n[*] Companies {'to process' if args.dry_run else 'needing reports'}: {len(companies_to_process)}")
+        log.info(f"\n[*] Companies {'to process' if args.dry_run else 'needing reports'}: {len(companies_to_process)}")
         for company in companies_to_process:
-            print(f"    - {company['name']} (ID: {company['id']})")
+            log.info(f"    - {company['name']} (ID: {company['id']})")
 
         # Create reports (NO CONFIRMATION PROMPT)
-        results = manager.create_reports_for_companies(companies_to_process, args.dry_run)
+        results = await manager.create_reports_for_companies(
+            companies_to_process,
+            args.dry_run,
+            include_locations=args.include_locations
+        )
 
         # Summary
-        print("\n" + "=" * 60)
-        print("SUMMARY")
-        print("=" * 60)
-        print(f"{'Would create' if args.dry_run else 'Successfully created'}: {len(results['success'])}")
+        log.info("\n" + "=" * 60)
+        log.info("SUMMARY")
+        log.info("=" * 60)
+        log.info(f"{'Would create' if args.dry_run else 'Successfully created'}: {len(results['success'])}")
         if results["failed"]:
-            print(f"Failed: {len(results['failed'])}")
+            log.info(f"Failed: {len(results['failed'])}")
             for name in results["failed"]:
-                print(f"  - {name}")
+                log.info(f"  - {name}")
 
         if args.dry_run:
-            print("\n[*] This was a dry run. Use without --dry-run to actually create reports.")
+            log.info("\n[*] This was a dry run. Use without --dry-run to actually create reports.")
 
         sys.exit(0 if not results["failed"] else 1)
 
     except Exception as e:
-        print(f"\n[!] Error: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"\n[!] Error: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":